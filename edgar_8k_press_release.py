@@ -2,6 +2,10 @@
 # edgar_8k_press_release_v2.py
 # ------------------------------------------------------------
 # Enhanced: progress bar (tqdm), resume, batching, and skip-downloaded logic.
+# Async rewrite: all SEC requests go through one shared aiohttp session and
+# run concurrently across CIKs (capped at 10 in flight per SEC fair-access).
+# Downstream consumers (read_press etc.) should extract exhibit text via
+# parse_exhibit() below, which uses lxml rather than a BeautifulSoup parse.
 # Usage examples:
 #   python edgar_8k_press_release_v2.py \
 
@@ -16,12 +20,26 @@
 #
 #   python edgar_8k_press_release_v2.py --resume_from press_releases_sp500.csv ...
 
-import os, re, time, argparse, json, sys
+import os, re, time, argparse, json, sys, asyncio, sqlite3
 from datetime import datetime
 from typing import Optional, Dict, Any, List
+import numpy as np
 import pandas as pd
 import requests
-from tqdm import tqdm 
+from requests.adapters import HTTPAdapter, Retry
+import aiohttp
+from tqdm.asyncio import tqdm
+
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None  # fall back to run_in_executor for disk writes
+
+try:
+    import orjson
+    _json_loads = orjson.loads  # ~3-5x faster on the multi-MB submission payloads
+except ImportError:
+    _json_loads = json.loads
 
 SEC_HEADERS = {
     # IMPORTANT: Replace with your real contact per SEC policy:
@@ -30,18 +48,121 @@ SEC_HEADERS = {
     "Accept-Encoding": "gzip, deflate",
 }
 
-SLEEP_BETWEEN_REQUESTS = 0.20  # seconds; SEC suggests <=10 req/s. Adjust at your own risk.
+MAX_IN_FLIGHT = 10        # concurrent SEC requests across all CIK tasks
+SEC_REQUESTS_PER_SEC = 10  # SEC fair-access cap
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.5
+
+# pooled session for the few sync requests made before the event loop starts
+SESSION = requests.Session()
+SESSION.headers.update(SEC_HEADERS)
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=20, pool_maxsize=20,
+    max_retries=Retry(total=RETRY_TOTAL, backoff_factor=RETRY_BACKOFF,
+                      status_forcelist=RETRY_STATUSES),
+))
+
+# compiled once; this runs for every file entry of every matching 8-K
+_EX99_RE = re.compile(r"ex-?99|exhibit\s*99", re.I)
+
+class _TokenBucket:
+    """Async token bucket: refills `rate` tokens/sec up to `burst`; use as `async with`."""
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return self
+                # sleep only for the actual slack until the next token
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    async def __aexit__(self, *exc):
+        return False
+
+class _HttpCache:
+    """SQLite cache of JSON GETs keyed by URL, revalidated with ETag/Last-Modified.
 
-def _norm_cik(cik) -> str:
-    s = re.sub(r"\D", "", str(cik))
-    return s.zfill(10) if s else ""
+    Submission JSONs only change when a company files and index.json is
+    immutable once an accession is final, so on resume runs most fetches
+    collapse to conditional GETs answered with 304.
+    """
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB)"
+        )
+        self._conn.commit()
+
+    def get(self, url: str):
+        return self._conn.execute(
+            "SELECT etag, last_modified, body FROM responses WHERE url=?", (url,)
+        ).fetchone()
+
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str], body: bytes):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?,?,?,?)",
+            (url, etag, last_modified, body),
+        )
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+async def _get_with_retry(session: aiohttp.ClientSession, limiter: _TokenBucket, url: str,
+                          **kwargs) -> aiohttp.ClientResponse:
+    """session.get with exponential backoff on transient SEC statuses."""
+    for attempt in range(RETRY_TOTAL + 1):
+        try:
+            async with limiter:
+                r = await session.get(url, **kwargs)
+        except aiohttp.ClientConnectionError:
+            if attempt >= RETRY_TOTAL:
+                raise
+        else:
+            if r.status not in RETRY_STATUSES or attempt >= RETRY_TOTAL:
+                return r
+            r.close()
+        await asyncio.sleep(RETRY_BACKOFF * (2 ** attempt))
+
+async def _get_json_cached(session: aiohttp.ClientSession, limiter: _TokenBucket,
+                           cache: _HttpCache, url: str) -> Dict[str, Any]:
+    cached = cache.get(url)
+    headers = {}
+    if cached:
+        etag, last_modified, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+    r = await _get_with_retry(session, limiter, url, headers=headers)
+    async with r:
+        if r.status == 304 and cached:
+            return _json_loads(cached[2])
+        r.raise_for_status()
+        body = await r.read()
+        cache.put(url, r.headers.get("ETag"), r.headers.get("Last-Modified"), body)
+        return _json_loads(body)
 
 def _load_universe(path: str, ticker_col: Optional[str], cik_col: Optional[str]) -> pd.DataFrame:
     df = pd.read_csv(path)
     if ticker_col and ticker_col in df.columns:
         df["TICKER"] = df[ticker_col].astype(str).str.strip().str.upper()
     if cik_col and cik_col in df.columns:
-        df["CIK"] = df[cik_col].astype(str).apply(_norm_cik)
+        cik = df[cik_col].astype(str).str.replace(r"\D", "", regex=True).fillna("")
+        df["CIK"] = cik.where(cik == "", cik.str.zfill(10))
     if "CIK" not in df.columns:
         df["CIK"] = ""
     if "TICKER" not in df.columns:
@@ -49,11 +170,27 @@ def _load_universe(path: str, ticker_col: Optional[str], cik_col: Optional[str])
     df = df.loc[(df["CIK"]!="") | (df["TICKER"]!="")].copy()
     return df[["TICKER", "CIK"]].drop_duplicates().reset_index(drop=True)
 
+_TICKER_MAP_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "edgar", "company_tickers.json")
+_TICKER_MAP_TTL = 86400 * 7  # the SEC file only gains rows when new issuers first file
+
 def _ticker_to_cik_map() -> dict:
     url = "https://www.sec.gov/files/company_tickers.json"
-    r = requests.get(url, headers=SEC_HEADERS, timeout=30)
-    r.raise_for_status()
-    data = r.json()
+    data = None
+    try:
+        if time.time() - os.path.getmtime(_TICKER_MAP_CACHE) < _TICKER_MAP_TTL:
+            with open(_TICKER_MAP_CACHE, "rb") as f:
+                data = _json_loads(f.read())
+    except (OSError, ValueError):
+        data = None  # missing/stale/corrupt cache: refetch
+    if data is None:
+        r = SESSION.get(url, timeout=30)
+        r.raise_for_status()
+        os.makedirs(os.path.dirname(_TICKER_MAP_CACHE), exist_ok=True)
+        tmp = _TICKER_MAP_CACHE + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(r.content)
+        os.replace(tmp, _TICKER_MAP_CACHE)  # atomic so readers never see partial JSON
+        data = _json_loads(r.content)
     m = {}
     for _, v in data.items():
         m[str(v.get("ticker","")).upper()] = str(v.get("cik_str","")).zfill(10)
@@ -63,39 +200,90 @@ def _ensure_cik(df: pd.DataFrame) -> pd.DataFrame:
     need = df["CIK"] == ""
     if need.any():
         mapping = _ticker_to_cik_map()
-        for idx in df[need].index:
-            t = df.at[idx, "TICKER"]
-            cik = mapping.get(t.upper(), "")
-            df.at[idx, "CIK"] = cik
-            time.sleep(SLEEP_BETWEEN_REQUESTS)
+        df.loc[need, "CIK"] = df.loc[need, "TICKER"].str.upper().map(mapping).fillna("")
     return df[df["CIK"]!=""].copy()
 
-def _company_submissions(cik: str) -> Dict[str, Any]:
+async def _company_submissions(session: aiohttp.ClientSession, limiter: _TokenBucket,
+                               cache: _HttpCache, cik: str) -> Dict[str, Any]:
     url = f"https://data.sec.gov/submissions/CIK{cik}.json"
-    r = requests.get(url, headers=SEC_HEADERS, timeout=30)
-    r.raise_for_status()
-    return r.json()
-
-def _find_item_202(items: List[str]) -> bool:
-    for it in items:
-        if re.search(r"(^|\b)2\.02(\b|$)", it):
-            return True
-        if re.search(r"item\s*2\.02", it, flags=re.I):
-            return True
-    return False
-
-def _download(url: str, out_path: str):
+    return await _get_json_cached(session, limiter, cache, url)
+
+def parse_exhibit(path: str) -> str:
+    """Visible-text extraction for a downloaded exhibit/primary HTML file.
+
+    Goes straight through lxml (5-10x faster than BeautifulSoup with
+    html.parser); any downstream text processing should use this hook.
+    """
+    import lxml.html  # imported lazily; only needed when parsing documents
+    root = lxml.html.parse(path).getroot()
+    for el in root.xpath("//script|//style"):
+        el.drop_tree()
+    return root.text_content()
+
+DOWNLOAD_CHUNK_SIZE = 65536  # stream documents in 64KB chunks; memory stays flat
+
+# common EDGAR exhibit-99 filenames; probing these with HEAD usually avoids
+# the extra index.json round-trip per filing
+_EXHIBIT_CANDIDATES = ["ex-99.htm", "ex-991.htm", "ex99.htm", "ex991.htm"]
+
+async def _head_ok(session: aiohttp.ClientSession, limiter: _TokenBucket, url: str) -> bool:
+    try:
+        async with limiter:
+            r = await session.head(url)
+        async with r:
+            return r.status == 200
+    except aiohttp.ClientError:
+        return False
+
+async def _find_exhibit_name(session: aiohttp.ClientSession, limiter: _TokenBucket,
+                             cache: _HttpCache, base: str, cik: str,
+                             name_hints: Dict[str, str]) -> Optional[str]:
+    # a known issuer convention answers in a single probe; only fan out to
+    # the remaining candidates when it misses
+    candidates = list(_EXHIBIT_CANDIDATES)
+    hint = name_hints.get(cik)
+    if hint in candidates:
+        if await _head_ok(session, limiter, f"{base}/{hint}"):
+            return hint
+        candidates.remove(hint)
+    hits = await asyncio.gather(*[_head_ok(session, limiter, f"{base}/{n}") for n in candidates])
+    for name, ok in zip(candidates, hits):
+        if ok:
+            name_hints[cik] = name
+            return name
+    # all probes missed: fall back to the directory listing
+    try:
+        files_json = await _get_json_cached(session, limiter, cache, f"{base}/index.json")
+    except aiohttp.ClientResponseError:
+        return None
+    for f in files_json.get("directory", {}).get("item", []):
+        if _EX99_RE.search(f.get("type","") + " " + f.get("name","")):
+            return f.get("name")
+    return None
+
+async def _download(session: aiohttp.ClientSession, limiter: _TokenBucket, url: str, out_path: str):
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
     # Skip if already exists (resume)
     if os.path.exists(out_path) and os.path.getsize(out_path) > 0:
         return
-    r = requests.get(url, headers=SEC_HEADERS, timeout=60)
-    r.raise_for_status()
-    with open(out_path, "wb") as f:
-        f.write(r.content)
+    r = await _get_with_retry(session, limiter, url, timeout=aiohttp.ClientTimeout(total=60))
+    async with r:
+        r.raise_for_status()
+        if aiofiles is not None:
+            async with aiofiles.open(out_path, "wb") as f:
+                async for chunk in r.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    await f.write(chunk)
+        else:
+            loop = asyncio.get_running_loop()
+            with open(out_path, "wb") as f:
+                async for chunk in r.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    await loop.run_in_executor(None, f.write, chunk)
 
-def crawl_8k_item202_for_cik(cik: str, start: str, end: str, out_dir: str, skip_dupes: set) -> List[dict]:
-    data = _company_submissions(cik)
+async def crawl_8k_item202_for_cik(session: aiohttp.ClientSession, limiter: _TokenBucket,
+                                   cache: _HttpCache, cik: str, start: str, end: str,
+                                   out_dir: str, skip_dupes: set,
+                                   exhibit_hints: Dict[str, str]) -> List[dict]:
+    data = await _company_submissions(session, limiter, cache, cik)
     recent = data.get("filings", {}).get("recent", {})
     forms = recent.get("form", [])
     accessions = recent.get("accessionNumber", [])
@@ -103,57 +291,47 @@ def crawl_8k_item202_for_cik(cik: str, start: str, end: str, out_dir: str, skip_
     primaryDocs = recent.get("primaryDocument", [])
     items_list = recent.get("items", [])
 
+    # pad items (SEC omits trailing entries) then filter all filings at once
+    if len(items_list) < len(forms):
+        items_list = items_list + [""] * (len(forms) - len(items_list))
+    rec = pd.DataFrame({"form": forms, "date": filingDates, "acc": accessions,
+                        "prim": primaryDocs, "items": items_list})
+    if rec.empty:
+        # empty recent lists build float64 columns, where .str would raise
+        return []
+    # parse dates once to datetime64[D]; comparisons are then C-level ints
+    dates = rec["date"].to_numpy(dtype="datetime64[D]")
+    mask = (
+        (rec["form"].to_numpy() == "8-K")
+        & (dates >= np.datetime64(start)) & (dates <= np.datetime64(end))
+        # plain substring: no 8-K item code other than 2.02 contains "2.02"
+        & rec["items"].str.contains("2.02", regex=False, na=False).to_numpy()
+    )
+
     out_rows = []
-    for i, form in enumerate(forms):
-        if form != "8-K":
-            continue
-        fdate = filingDates[i]
-        if fdate < start or fdate > end:
-            continue
-        items_str = items_list[i] if i < len(items_list) else ""
-        items = [s.strip() for s in items_str.split("|") if s.strip()]
-        if not _find_item_202(items):
-            continue
-        accession = accessions[i]
-        key = f"{cik}:{accession}"
-        if key in skip_dupes:
+    for row in rec.loc[mask].itertuples():
+        fdate = row.date
+        accession = row.acc
+        if (cik, accession) in skip_dupes:
             continue  # already recorded
-        primary = primaryDocs[i]
+        primary = row.prim
         acc_nodashes = accession.replace("-", "")
         base = f"https://www.sec.gov/Archives/edgar/data/{int(cik)}/{acc_nodashes}"
 
-        # list files
-        idx_url = f"{base}/index.json"
-        r = requests.get(idx_url, headers=SEC_HEADERS, timeout=30)
-        if r.status_code != 200:
-            time.sleep(SLEEP_BETWEEN_REQUESTS)
-            continue
-        files_json = r.json()
-
-        # find exhibit 99.*
-        exhibit_name = None
-        for f in files_json.get("directory", {}).get("item", []):
-            name = f.get("name","").lower()
-            desc = (f.get("type","") + " " + f.get("name","")).lower()
-            if ("ex99" in name) or ("exhibit99" in name) or re.search(r"ex-?99", name):
-                exhibit_name = f.get("name")
-                break
-            if re.search(r"exhibit\s*99", desc, flags=re.I):
-                exhibit_name = f.get("name")
-                break
+        # find exhibit 99.* (HEAD probes first, index.json only on all-miss)
+        exhibit_name = await _find_exhibit_name(session, limiter, cache, base, cik, exhibit_hints)
 
         main_url = f"{base}/{primary}"
         exhibit_url = f"{base}/{exhibit_name}" if exhibit_name else ""
 
         local_root = os.path.join(out_dir, cik, acc_nodashes)
         main_local = os.path.join(local_root, os.path.basename(primary))
-        _download(main_url, main_local)
-        time.sleep(SLEEP_BETWEEN_REQUESTS)
+        await _download(session, limiter, main_url, main_local)
         exhibit_local = ""
         if exhibit_url:
             exhibit_local = os.path.join(local_root, os.path.basename(exhibit_name))
             try:
-                _download(exhibit_url, exhibit_local)
+                await _download(session, limiter, exhibit_url, exhibit_local)
             except Exception:
                 pass
 
@@ -166,9 +344,33 @@ def crawl_8k_item202_for_cik(cik: str, start: str, end: str, out_dir: str, skip_
             "main_local": main_local,
             "exhibit99_local": exhibit_local,
         })
-        time.sleep(SLEEP_BETWEEN_REQUESTS)
     return out_rows
 
+async def _crawl_all(df: pd.DataFrame, start: str, end: str, out_dir: str, skip_dupes: set) -> List[dict]:
+    # dual-class tickers (GOOG/GOOGL etc.) share a CIK; one task per CIK so
+    # concurrent crawls never race _download on the same local paths
+    df = df.drop_duplicates("CIK")
+    limiter = _TokenBucket(SEC_REQUESTS_PER_SEC, SEC_REQUESTS_PER_SEC)
+    cache = _HttpCache(os.path.join(out_dir, ".cache", "submissions.sqlite"))
+    connector = aiohttp.TCPConnector(limit=MAX_IN_FLIGHT)
+    timeout = aiohttp.ClientTimeout(total=30)
+    all_rows = []
+    try:
+        async with aiohttp.ClientSession(headers=SEC_HEADERS, connector=connector, timeout=timeout) as session:
+            exhibit_hints: Dict[str, str] = {}
+            tasks = [crawl_8k_item202_for_cik(session, limiter, cache, cik, start, end, out_dir,
+                                              skip_dupes, exhibit_hints)
+                     for cik in df["CIK"]]
+            for fut in tqdm.as_completed(tasks, total=len(tasks), desc="CIKs"):
+                try:
+                    all_rows.extend(await fut)
+                except Exception as e:
+                    # continue on errors
+                    pass
+    finally:
+        cache.close()
+    return all_rows
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--universe", required=True)
@@ -196,37 +398,27 @@ def main():
     else:
         df = df.iloc[args.batch_start:].copy()
 
-    # Resume set
+    # Resume set: anything already in resume_from or out_csv is filtered
+    # before the crawl, so the output can be append-only (only key columns
+    # are loaded, never the full corpus).
     skip_dupes = set()
-    if args.resume_from and os.path.exists(args.resume_from):
-        old = pd.read_csv(args.resume_from)
-        if not old.empty and {"cik","accession"}.issubset(old.columns):
-            skip_dupes = set((old["cik"].astype(str)+":"+old["accession"].astype(str)).tolist())
+    for prior in (args.resume_from, args.out_csv):
+        if prior and os.path.exists(prior):
+            try:
+                # dtype=str keeps the zero-padded cik intact so membership
+                # checks against the crawler's padded keys actually match
+                old = pd.read_csv(prior, usecols=["cik", "accession"], dtype=str)
+            except ValueError:
+                continue  # file lacks the key columns
+            skip_dupes |= set(zip(old["cik"].astype(str), old["accession"].astype(str)))
 
-    all_rows = []
-    for _, r in tqdm(df.iterrows(), total=len(df), desc="CIKs"):
-        cik = r["CIK"]
-        try:
-            rows = crawl_8k_item202_for_cik(cik, args.start, args.end, args.out_dir, skip_dupes)
-            all_rows.extend(rows)
-        except Exception as e:
-            # continue on errors
-            pass
+    all_rows = asyncio.run(_crawl_all(df, args.start, args.end, args.out_dir, skip_dupes))
 
-    # Write / append
+    # Append only the new rows; dedupe already happened via skip_dupes
     new_df = pd.DataFrame(all_rows)
-    if os.path.exists(args.out_csv):
-        base = pd.read_csv(args.out_csv)
-        full = pd.concat([base, new_df], ignore_index=True)
-    else:
-        full = new_df
-
-    # Deduplicate by cik+accession
-    if not full.empty:
-        full["dupe_key"] = full["cik"].astype(str) + ":" + full["accession"].astype(str)
-        full = full.drop_duplicates("dupe_key").drop(columns=["dupe_key"])
-        full.to_csv(args.out_csv, index=False)
-        print(f"Saved {len(full)} total rows -> {args.out_csv}")
+    if not new_df.empty:
+        new_df.to_csv(args.out_csv, mode="a", header=not os.path.exists(args.out_csv), index=False)
+        print(f"Appended {len(new_df)} new rows -> {args.out_csv}")
     else:
         print("No 8-K Item 2.02 filings found in range.")
 
@@ -1,6 +1,22 @@
 # ...existing code...
+import logging
+import os
+import re
 from pathlib import Path
-import pandas as pd
+
+# EDGAR_FAST=1 时用modin并行化read_csv/str.extract/to_datetime（Ray/Dask多核）
+if os.environ.get('EDGAR_FAST') == '1':
+    try:
+        import modin.pandas as pd
+    except ImportError:
+        import pandas as pd
+else:
+    import pandas as pd
+
+# ticker assumed at the start of text, "-"-separated, 2-5 letters
+_TICKER_RE = re.compile(r'^\s*([A-Za-z]{2,5})\s*-')
+
+log = logging.getLogger(__name__)
 
 def read_press(path='/Users/sally/Desktop/Fall2025/NLP/Project_1/build_press_corpus/press_releases_sp500.csv'):
     p = Path(path)
@@ -9,23 +25,24 @@ def read_press(path='/Users/sally/Desktop/Fall2025/NLP/Project_1/build_press_cor
         if alt:
             p = alt[0]
         else:
-            print('⚠️ No press release CSV found. Skipping tariff sentiment...')
+            log.warning('No press release CSV found. Skipping tariff sentiment...')
             return None
 # ...existing
 
-    # 首先检查CSV文件的列结构
-    df = pd.read_csv(p)
-    print(f"Original columns: {list(df.columns)}")
-    
-    df.columns = [c.lower() for c in df.columns]
-    print(f"Lowercased columns: {list(df.columns)}")
-    
+    # 先只读表头确定列结构，再按需读取需要的三列
+    header_cols = pd.read_csv(p, nrows=0).columns
+    log.debug("Original columns: %s", list(header_cols))
+
+    # lowercase -> 原始列名 的映射
+    cols = {c.lower(): c for c in header_cols}
+    log.debug("Lowercased columns: %s", list(cols))
+
     # 检查是否同时有id和ticker列
-    has_id = 'id' in df.columns
-    has_ticker = 'ticker' in df.columns
-    
+    has_id = 'id' in cols
+    has_ticker = 'ticker' in cols
+
     if has_id and has_ticker:
-        print("Both 'id' and 'ticker' columns found. Using 'ticker' column.")
+        log.debug("Both 'id' and 'ticker' columns found. Using 'ticker' column.")
         idc = 'ticker'
     elif has_ticker:
         idc = 'ticker'
@@ -33,45 +50,39 @@ def read_press(path='/Users/sally/Desktop/Fall2025/NLP/Project_1/build_press_cor
         idc = 'id'
     else:
         # 如果既没有id也没有ticker，尝试其他标识符
-        idc = next((c for c in ['symbol','permno'] if c in df.columns), None)
-    
-    txt = next((c for c in ['text','body','content'] if c in df.columns), None)
-    dte = next((c for c in ['date','ann_date','timestamp'] if c in df.columns), None)
-    
-    print(f"Detected columns: identifier={idc}, text={txt}, date={dte}")
-    
+        idc = next((c for c in ['symbol','permno'] if c in cols), None)
+
+    txt = next((c for c in ['text','body','content'] if c in cols), None)
+    dte = next((c for c in ['date','ann_date','timestamp'] if c in cols), None)
+
+    log.debug("Detected columns: identifier=%s, text=%s, date=%s", idc, txt, dte)
+
     if not all([idc, txt, dte]):
-        print("Available columns that might contain identifier info:", [c for c in df.columns if 'tick' in c or 'symb' in c or 'id' in c])
-        print("Available columns that might contain text info:", [c for c in df.columns if 'text' in c or 'body' in c or 'content' in c])
-        print("Available columns that might contain date info:", [c for c in df.columns if 'date' in c or 'time' in c])
+        log.debug("Available columns that might contain identifier info: %s", [c for c in cols if 'tick' in c or 'symb' in c or 'id' in c])
+        log.debug("Available columns that might contain text info: %s", [c for c in cols if 'text' in c or 'body' in c or 'content' in c])
+        log.debug("Available columns that might contain date info: %s", [c for c in cols if 'date' in c or 'time' in c])
         raise ValueError('press release file must have identifier (ticker/id), date, and text columns')
-    
+
+    # 只载入这三列，并给定dtype，避免整表object解析
+    df = pd.read_csv(p, usecols=[cols[idc], cols[txt], cols[dte]],
+                     dtype={cols[idc]: 'string', cols[txt]: 'string'})
+    df.columns = [c.lower() for c in df.columns]
+
     # 重命名为ticker列，无论原来是什么
     df = df.rename(columns={idc:'ticker', txt:'text', dte:'date'})
-    df['date'] = pd.to_datetime(df['date']).dt.normalize()
+    df['date'] = pd.to_datetime(df['date'], format='ISO8601').dt.normalize()
     
     # 如果ticker列是NaN，尝试从text列中提取ticker
     if df['ticker'].isna().all():
-        print("Ticker column is all NaN. Attempting to extract ticker from text column...")
-        
-        # 假设ticker在text的开头，以"-"分隔
-        def extract_ticker(text):
-            if pd.isna(text):
-                return None
-            # 提取第一个"-"之前的部分作为ticker
-            parts = str(text).split('-')
-            if len(parts) > 0:
-                ticker = parts[0].strip().upper()
-                # 验证ticker格式（通常3-4个字母）
-                if len(ticker) >= 2 and len(ticker) <= 5 and ticker.isalpha():
-                    return ticker
-            return None
-        
-        df['ticker'] = df['text'].apply(extract_ticker)
-        print(f"Extracted tickers. Sample: {df['ticker'].dropna().head(3).tolist()}")
+        log.debug("Ticker column is all NaN. Attempting to extract ticker from text column...")
+
+        # 提取第一个"-"之前的部分作为ticker（向量化，C级别执行）
+        df['ticker'] = df['text'].str.extract(_TICKER_RE, expand=False).str.upper()
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Extracted tickers. Sample: %s", df['ticker'].dropna().head(3).tolist())
     
-    # 显示样本数据以确认
-    print(f"Sample data after processing:")
-    print(df[['ticker','date','text']].head(3))
+    # 显示样本数据以确认（DEBUG时才格式化，避免无谓的repr开销）
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Sample data after processing:\n%s", df[['ticker','date','text']].head(3))
     
     return df[['ticker','date','text']]